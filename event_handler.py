@@ -1,166 +1,259 @@
 #!/usr/bin/env python3
 
-import asyncio
+import functools
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, Set
-from bs4 import BeautifulSoup
+from typing import Dict, Iterable, List, Optional, Tuple
+from selectolax.lexbor import LexborHTMLParser
 from dateutil import parser as date_parser
-import hashlib
 import re
+import xxhash
 
 
-class EventHandler:
-    def __init__(self):
-        self.seen_incidents: Set[str] = set()
-        self._lock = asyncio.Lock()
+_STATUS_KEYWORDS = (
+    'operational', 'degraded', 'partial', 'major', 'maintenance',
+    'outage', 'incident', 'investigating', 'monitoring', 'resolved',
+)
 
-    def _get_timestamp(self) -> str:
-        return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+_STATUS_RE = re.compile(
+    r'status:\s*(\w+)|(' + '|'.join(_STATUS_KEYWORDS) + ')',
+    re.IGNORECASE
+)
+
+_STATUS_LABELS = {keyword: sys.intern(keyword.title()) for keyword in _STATUS_KEYWORDS}
+
+_SEPARATOR = "=" * 80
+
+_ISO_ACCEPTS_Z = sys.version_info >= (3, 11)
+
+
+def _fast_parse(value: str) -> Optional[datetime]:
+    if not isinstance(value, str):
+        return None
+
+    try:
+        return datetime.fromisoformat(value if _ISO_ACCEPTS_Z else value.replace('Z', '+00:00'))
+    except ValueError:
+        try:
+            return date_parser.parse(value)
+        except:
+            return None
+
+
+@functools.lru_cache(maxsize=256)
+def _extract(description: str) -> Tuple[Tuple[str, ...], str]:
+    tree = LexborHTMLParser(description)
 
-    async def is_seen(self, incident_id: str) -> bool:
-        async with self._lock:
-            return incident_id in self.seen_incidents
+    components = []
+    for tag in tree.css('strong, b'):
+        text = tag.text(strip=True)
+        if text and not text.lower().startswith('status'):
+            components.append(text)
 
-    async def mark_seen(self, incident_id: str):
-        async with self._lock:
-            self.seen_incidents.add(incident_id)
+    status = 'Unknown'
+    description_text = tree.body.text(separator=' ', strip=True) if tree.body else ''
+    match = _STATUS_RE.search(description_text)
+    if match:
+        label = match.group(1) or match.group(2)
+        status = _STATUS_LABELS.get(label.lower()) or label.title()
 
-    def _normalize_webhook_data(self, event_data: Dict, source_name: str) -> Dict:
+    return tuple(components), status
+
+
+def clear_rss_cache():
+    _extract.cache_clear()
+
+
+@dataclass(slots=True)
+class Incident:
+    id: str
+    source: str
+    source_type: str
+    event_type: str = ''
+    title: str = ''
+    status: str = 'Unknown'
+    severity: str = ''
+    description: str = ''
+    components: List[str] = field(default_factory=list)
+    link: str = ''
+    timestamp: str = ''
+
+
+class EventHandler:
+    def __init__(self, max_seen_incidents: int = 100_000):
+        self.seen_incidents: "OrderedDict[str, None]" = OrderedDict()
+        self.max_seen_incidents = max_seen_incidents
+        self._ts_cache = (-1, '')
+        self._normalizers = {
+            'incident.io': self._normalize_incident_io,
+        }
+
+    def _get_timestamp(self) -> str:
+        t = int(time.time())
+        cached_sec, cached_str = self._ts_cache
+        if t != cached_sec:
+            cached_str = datetime.fromtimestamp(t).strftime("%Y-%m-%d %H:%M:%S")
+            self._ts_cache = (t, cached_str)
+        return cached_str
+
+    def is_seen(self, incident_id: str) -> bool:
+        return incident_id in self.seen_incidents
+
+    def mark_seen(self, incident_id: str):
+        self._check_and_mark(incident_id)
+
+    def refresh_seen(self, incident_ids: Iterable[str]):
+        for incident_id in incident_ids:
+            if incident_id in self.seen_incidents:
+                self.seen_incidents.move_to_end(incident_id)
+
+    def _check_and_mark(self, incident_id: str) -> bool:
+        if incident_id in self.seen_incidents:
+            self.seen_incidents.move_to_end(incident_id)
+            return True
+
+        self.seen_incidents[incident_id] = None
+        if len(self.seen_incidents) > self.max_seen_incidents:
+            self.seen_incidents.popitem(last=False)
+        return False
+
+    def _normalize_webhook_data(self, event_data: Dict, source_name: str) -> Incident:
         event_type = event_data.get('event_type', '')
         data = event_data.get('data', event_data)
         incident = data.get('incident', data)
 
-        normalized = {
-            'id': incident.get('id', ''),
-            'source': source_name,
-            'source_type': 'webhook',
-            'event_type': event_type,
-            'title': incident.get('name', incident.get('title', 'Unknown Incident')),
-            'status': incident.get('status', {}).get('label', 'Unknown') if isinstance(incident.get('status'), dict) else str(incident.get('status', 'Unknown')),
-            'severity': incident.get('severity', {}).get('label', '') if isinstance(incident.get('severity'), dict) else '',
-            'description': incident.get('summary', incident.get('description', '')),
-            'components': [],
-            'link': incident.get('permalink', incident.get('url', '')),
-            'timestamp': datetime.utcnow().isoformat(),
-        }
+        normalized = Incident(
+            id=incident.get('id', ''),
+            source=sys.intern(source_name),
+            source_type='webhook',
+            event_type=event_type,
+            title=incident.get('name', incident.get('title', 'Unknown Incident')),
+            status=incident.get('status', {}).get('label', 'Unknown') if isinstance(incident.get('status'), dict) else str(incident.get('status', 'Unknown')),
+            severity=incident.get('severity', {}).get('label', '') if isinstance(incident.get('severity'), dict) else '',
+            description=incident.get('summary', incident.get('description', '')),
+            link=incident.get('permalink', incident.get('url', '')),
+        )
 
         if 'affected_components' in incident:
-            normalized['components'] = [
+            normalized.components = [
                 comp.get('name', str(comp))
                 for comp in incident['affected_components']
             ]
 
         created_at = incident.get('created_at', event_data.get('created_at'))
-        if created_at:
-            try:
-                dt = date_parser.parse(created_at)
-                normalized['timestamp'] = dt.strftime("%Y-%m-%d %H:%M:%S")
-            except:
-                pass
+        normalized.timestamp = self._format_created_at(created_at)
 
         return normalized
 
-    def _normalize_rss_data(self, entry: Dict, source_name: str) -> Dict:
+    def _normalize_incident_io(self, event_data: Dict, source_name: str) -> Incident:
+        try:
+            incident = event_data['data']['incident']
+            return Incident(
+                id=incident['id'],
+                source=sys.intern(source_name),
+                source_type='webhook',
+                event_type=event_data.get('event_type', ''),
+                title=incident['name'],
+                status=incident['status']['label'] if 'status' in incident else 'Unknown',
+                severity=incident['severity']['label'] if 'severity' in incident else '',
+                description=incident.get('summary', incident.get('description', '')),
+                components=[comp['name'] for comp in incident.get('affected_components', ())],
+                link=incident.get('permalink', incident.get('url', '')),
+                timestamp=self._format_created_at(incident.get('created_at', event_data.get('created_at'))),
+            )
+        except (KeyError, TypeError):
+            return self._normalize_webhook_data(event_data, source_name)
+
+    def _format_created_at(self, created_at) -> str:
+        dt = _fast_parse(created_at) if created_at else None
+        if dt:
+            return dt.strftime("%Y-%m-%d %H:%M:%S")
+        return datetime.utcnow().isoformat()
+
+    def _normalize_rss_data(self, entry: Dict, source_name: str) -> Incident:
         incident_id = entry.get('id', entry.get('guid', ''))
         if not incident_id:
             id_source = f"{entry.get('title', '')}{entry.get('published', '')}"
-            incident_id = hashlib.md5(id_source.encode()).hexdigest()
-
-        normalized = {
-            'id': incident_id,
-            'source': source_name,
-            'source_type': 'rss',
-            'title': entry.get('title', 'Unknown Incident'),
-            'description': entry.get('description', entry.get('summary', '')),
-            'link': entry.get('link', ''),
-            'components': [],
-            'status': 'Unknown',
-            'timestamp': entry.get('published', ''),
-        }
-
-        description = normalized['description']
-        if description:
-            soup = BeautifulSoup(description, 'lxml')
-
-            component_tags = soup.find_all(['strong', 'b'])
-            for tag in component_tags:
-                text = tag.get_text(strip=True)
-                if text and not text.lower().startswith('status'):
-                    normalized['components'].append(text)
-
-            description_text = soup.get_text(separator=' ', strip=True)
-            status_patterns = [
-                r'(operational|degraded|partial|major|maintenance|outage|incident|investigating|monitoring|resolved)',
-                r'status:\s*(\w+)',
-            ]
-
-            for pattern in status_patterns:
-                match = re.search(pattern, description_text, re.IGNORECASE)
-                if match:
-                    normalized['status'] = match.group(1).title()
-                    break
-
-        if normalized['timestamp']:
-            try:
-                dt = date_parser.parse(normalized['timestamp'])
-                normalized['timestamp'] = dt.strftime("%Y-%m-%d %H:%M:%S")
-            except:
-                normalized['timestamp'] = self._get_timestamp()
+            incident_id = xxhash.xxh3_64_hexdigest(id_source)
+
+        normalized = Incident(
+            id=incident_id,
+            source=sys.intern(source_name),
+            source_type='rss',
+            title=entry.get('title', 'Unknown Incident'),
+            description=entry.get('description', entry.get('summary', '')),
+            link=entry.get('link', ''),
+            timestamp=entry.get('published', ''),
+        )
+
+        if normalized.description:
+            components, normalized.status = _extract(normalized.description)
+            normalized.components = list(components)
+
+        dt = _fast_parse(normalized.timestamp) if normalized.timestamp else None
+        if dt:
+            normalized.timestamp = dt.strftime("%Y-%m-%d %H:%M:%S")
         else:
-            normalized['timestamp'] = self._get_timestamp()
+            normalized.timestamp = self._get_timestamp()
 
         return normalized
 
-    def _format_incident_output(self, incident: Dict) -> str:
-        components_str = ', '.join(incident['components']) if incident['components'] else 'General'
-        output = f"[{incident['timestamp']}] "
+    def _format_incident_output(self, incident: Incident) -> str:
+        components_str = ', '.join(incident.components) if incident.components else 'General'
+        output = f"[{incident.timestamp}] "
 
-        if incident['source']:
-            output += f"Provider: {incident['source']} | "
+        if incident.source:
+            output += f"Provider: {incident.source} | "
 
         output += f"Product: {components_str}\n"
-        output += f"Status: {incident['status']} - {incident['title']}"
+        output += f"Status: {incident.status} - {incident.title}"
 
-        if incident.get('event_type'):
-            output += f"\nEvent: {incident['event_type']}"
+        if incident.event_type:
+            output += f"\nEvent: {incident.event_type}"
 
-        if incident.get('link'):
-            output += f"\nLink: {incident['link']}"
+        if incident.link:
+            output += f"\nLink: {incident.link}"
 
         return output
 
+    def _print_incident(self, incident: Incident):
+        sys.stdout.write(f"\n{_SEPARATOR}\n{self._format_incident_output(incident)}\n{_SEPARATOR}\n")
+
     async def handle_webhook_event(self, event_data: Dict, source_name: str = "Unknown"):
         try:
-            incident = self._normalize_webhook_data(event_data, source_name)
+            normalize = self._normalizers.get(source_name, self._normalize_webhook_data)
+            incident = normalize(event_data, source_name)
 
-            if await self.is_seen(incident['id']):
-                print(f"[{self._get_timestamp()}] Duplicate webhook event (already seen): {incident['id']}")
+            if self._check_and_mark(incident.id):
+                print(f"[{self._get_timestamp()}] Duplicate webhook event (already seen): {incident.id}")
                 return
 
-            await self.mark_seen(incident['id'])
-
-            print("\n" + "=" * 80)
-            print(self._format_incident_output(incident))
-            print("=" * 80)
+            self._print_incident(incident)
 
         except Exception as e:
             print(f"[{self._get_timestamp()}] Error processing webhook event: {e}")
 
-    async def handle_rss_entry(self, entry: Dict, source_name: str = "Unknown"):
-        try:
-            incident = self._normalize_rss_data(entry, source_name)
-
-            if await self.is_seen(incident['id']):
-                return
+    def normalize_rss_entries(self, entries: List[Dict], source_name: str = "Unknown") -> List[Incident]:
+        incidents = []
+        for entry in entries:
+            try:
+                incidents.append(self._normalize_rss_data(entry, source_name))
+            except Exception as e:
+                print(f"[{self._get_timestamp()}] Error processing RSS entry: {e}")
+        return incidents
 
-            await self.mark_seen(incident['id'])
+    async def handle_rss_incidents(self, incidents: List[Incident]):
+        for incident in incidents:
+            if self._check_and_mark(incident.id):
+                continue
 
-            print("\n" + "=" * 80)
-            print(self._format_incident_output(incident))
-            print("=" * 80)
+            self._print_incident(incident)
 
-        except Exception as e:
-            print(f"[{self._get_timestamp()}] Error processing RSS entry: {e}")
+    async def handle_rss_entry(self, entry: Dict, source_name: str = "Unknown"):
+        await self.handle_rss_incidents(self.normalize_rss_entries([entry], source_name))
 
 
 event_handler = EventHandler()
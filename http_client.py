@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+
+import httpx
+from typing import Optional
+
+
+_client: Optional[httpx.AsyncClient] = None
+_closed = False
+
+
+def is_closed() -> bool:
+    return _closed
+
+
+def open_client() -> httpx.AsyncClient:
+    global _closed
+
+    _closed = False
+    return get_client()
+
+
+def get_client() -> httpx.AsyncClient:
+    global _client
+
+    if _closed:
+        raise RuntimeError("Shared HTTP client has been closed")
+
+    if _client is None:
+        limits = httpx.Limits(
+            max_connections=1024,
+            max_keepalive_connections=64
+        )
+        _client = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(30.0),
+            follow_redirects=True,
+            limits=limits
+        )
+
+    return _client
+
+
+async def close_client():
+    global _client, _closed
+
+    _closed = True
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -1,12 +1,63 @@
 #!/usr/bin/env python3
 
 import asyncio
-import aiohttp
-import feedparser
+import httpx
+import xxhash
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from lxml import etree
+from typing import Dict, List, Optional, Tuple, Union
 
-from event_handler import event_handler
+from event_handler import Incident, clear_rss_cache, event_handler
+import http_client
+
+
+FETCH_TIMEOUT = 30
+
+_XML_PARSER = etree.XMLParser(recover=True, resolve_entities=False, no_network=True)
+
+_ENTRY_FIELDS = {
+    'id': ('guid', 'id'),
+    'title': ('title',),
+    'link': ('link',),
+    'description': ('description', 'summary', 'content'),
+    'published': ('pubDate', 'published', 'updated'),
+}
+
+
+def _parse_entry(item: etree._Element) -> Dict[str, str]:
+    children: Dict[str, etree._Element] = {}
+    for child in item:
+        if isinstance(child.tag, str):
+            children.setdefault(etree.QName(child).localname, child)
+
+    entry = {}
+    for field, names in _ENTRY_FIELDS.items():
+        for name in names:
+            element = children.get(name)
+            if element is None:
+                continue
+            value = (element.text or '').strip() or element.get('href', '')
+            if value:
+                entry[field] = value
+                break
+
+    return entry
+
+
+def _parse_feed(content: Union[str, bytes]) -> List[Dict[str, str]]:
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+
+    root = etree.fromstring(content, _XML_PARSER)
+    if root is None:
+        return []
+
+    items = root.xpath('.//item | .//*[local-name()="entry"]')
+    return [_parse_entry(item) for item in items]
+
+
+def _parse_feed_incidents(content: Union[str, bytes], source_name: str) -> List[Incident]:
+    return event_handler.normalize_rss_entries(_parse_feed(content), source_name)
 
 
 class RSSPoller:
@@ -19,33 +70,23 @@ class RSSPoller:
         ]
         self.etags: Dict[str, str] = {}
         self.last_modified: Dict[str, str] = {}
-        self.session: Optional[aiohttp.ClientSession] = None
+        self.content_hashes: Dict[str, int] = {}
+        self.feed_incident_ids: Dict[str, List[str]] = {}
+        self.session: Optional[httpx.AsyncClient] = None
         self.running = True
 
     def _get_timestamp(self) -> str:
         return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
     async def create_session(self):
-        if not self.session:
-            timeout = aiohttp.ClientTimeout(total=30)
-            connector = aiohttp.TCPConnector(
-                limit=100,
-                limit_per_host=10,
-                ttl_dns_cache=300
-            )
-            self.session = aiohttp.ClientSession(
-                connector=connector,
-                timeout=timeout
-            )
+        self.session = http_client.get_client()
 
     async def close_session(self):
-        if self.session:
-            await self.session.close()
-            self.session = None
+        self.session = None
 
-    async def fetch_feed(self, feed_config: Dict[str, str]) -> Tuple[Optional[str], bool]:
+    async def fetch_feed(self, feed_config: Dict[str, str]) -> Tuple[Optional[bytes], bool]:
         url = feed_config['url']
-        headers = {}
+        headers = {'Accept-Encoding': 'br, gzip'}
 
         if url in self.etags:
             headers['If-None-Match'] = self.etags[url]
@@ -54,46 +95,72 @@ class RSSPoller:
             headers['If-Modified-Since'] = self.last_modified[url]
 
         try:
-            async with self.session.get(url, headers=headers) as response:
-                if response.status == 304:
-                    return None, False
+            response = await asyncio.wait_for(
+                self.session.get(url, headers=headers),
+                timeout=FETCH_TIMEOUT
+            )
+            if response.status_code == 304:
+                return None, False
 
-                if response.status != 200:
-                    print(f"[{self._get_timestamp()}] RSS Error: {feed_config['name']} - "
-                          f"HTTP {response.status}")
-                    return None, False
+            if response.status_code != 200:
+                print(f"[{self._get_timestamp()}] RSS Error: {feed_config['name']} - "
+                      f"HTTP {response.status_code}")
+                return None, False
 
-                if 'ETag' in response.headers:
-                    self.etags[url] = response.headers['ETag']
+            if 'ETag' in response.headers:
+                self.etags[url] = response.headers['ETag']
 
-                if 'Last-Modified' in response.headers:
-                    self.last_modified[url] = response.headers['Last-Modified']
+            if 'Last-Modified' in response.headers:
+                self.last_modified[url] = response.headers['Last-Modified']
 
-                content = await response.text()
-                return content, True
+            return response.content, True
 
-        except asyncio.TimeoutError:
+        except (asyncio.TimeoutError, httpx.TimeoutException):
             print(f"[{self._get_timestamp()}] RSS Timeout: {feed_config['name']}")
             return None, False
         except Exception as e:
-            print(f"[{self._get_timestamp()}] RSS Error: {feed_config['name']} - {e}")
+            if not http_client.is_closed():
+                print(f"[{self._get_timestamp()}] RSS Error: {feed_config['name']} - {e}")
             return None, False
 
     async def check_feed_for_updates(self, feed_config: Dict[str, str]):
+        url = feed_config['url']
         content, was_modified = await self.fetch_feed(feed_config)
 
         if not content:
+            event_handler.refresh_seen(self.feed_incident_ids.get(url, ()))
+            return
+
+        content_hash = xxhash.xxh3_64_intdigest(content)
+        if self.content_hashes.get(url) == content_hash:
+            event_handler.refresh_seen(self.feed_incident_ids.get(url, ()))
+            return
+
+        loop = asyncio.get_running_loop()
+        try:
+            incidents = await loop.run_in_executor(
+                None, _parse_feed_incidents, content, feed_config['name']
+            )
+        except etree.XMLSyntaxError as e:
+            print(f"[{self._get_timestamp()}] RSS Parse Error: {feed_config['name']} - {e}")
             return
 
-        feed = feedparser.parse(content)
+        await event_handler.handle_rss_incidents(incidents)
 
-        for entry in feed.entries:
-            await event_handler.handle_rss_entry(entry, feed_config['name'])
+        self.content_hashes[url] = content_hash
+        self.feed_incident_ids[url] = [incident.id for incident in incidents]
 
     async def check_all_feeds(self):
+        if http_client.is_closed():
+            print(f"[{self._get_timestamp()}] RSS Poller: HTTP client closed, stopping")
+            self.stop()
+            return
+
         if not self.session:
             await self.create_session()
 
+        clear_rss_cache()
+
         tasks = [
             self.check_feed_for_updates(feed_config)
             for feed_config in self.feed_configs
@@ -137,7 +204,10 @@ async def main():
     ]
 
     poller = RSSPoller(feed_configs)
-    await poller.poll_loop(interval=180)
+    try:
+        await poller.poll_loop(interval=180)
+    finally:
+        await http_client.close_client()
 
 
 if __name__ == "__main__":
@@ -1,14 +1,17 @@
 #!/usr/bin/env python3
 
-from fastapi import FastAPI, Request, HTTPException, BackgroundTasks
+import asyncio
+from fastapi import FastAPI, Request, HTTPException
 from fastapi.responses import JSONResponse
 from datetime import datetime
 import hmac
+import orjson
 import hashlib
 import time
 from typing import Dict
 
 from event_handler import event_handler
+import http_client
 
 app = FastAPI(
     title="Status Page Webhook Receiver",
@@ -16,6 +19,13 @@ app = FastAPI(
 )
 
 
+_HEX_DIGITS = frozenset('0123456789abcdef')
+
+
+def _is_sha256_hex(signature: str) -> bool:
+    return len(signature) == 64 and _HEX_DIGITS.issuperset(signature)
+
+
 def verify_svix_signature(
     payload: bytes,
     webhook_id: str,
@@ -31,36 +41,94 @@ def verify_svix_signature(
     except (ValueError, TypeError):
         return False
 
-    signed_content = f"{webhook_id}.{webhook_timestamp}.{payload.decode('utf-8')}"
-    expected_sig = hmac.new(
-        secret.encode('utf-8'),
-        signed_content.encode('utf-8'),
-        hashlib.sha256
-    ).hexdigest()
-
     if ',' in webhook_signature:
         actual_sig = webhook_signature.split(',')[1]
     else:
         actual_sig = webhook_signature
 
+    if not _is_sha256_hex(actual_sig):
+        return False
+
+    signed_content = webhook_id.encode('utf-8') + b'.' + webhook_timestamp.encode('utf-8') + b'.' + payload
+    expected_sig = hmac.new(
+        secret.encode('utf-8'),
+        signed_content,
+        hashlib.sha256
+    ).hexdigest()
+
     return hmac.compare_digest(expected_sig, actual_sig)
 
 
 def verify_hmac_signature(payload: bytes, signature: str, secret: str) -> bool:
+    if signature.startswith('sha256='):
+        signature = signature[7:]
+
+    if not _is_sha256_hex(signature):
+        return False
+
     expected_sig = hmac.new(
         secret.encode('utf-8'),
         payload,
         hashlib.sha256
     ).hexdigest()
 
-    if signature.startswith('sha256='):
-        signature = signature[7:]
-
     return hmac.compare_digest(expected_sig, signature)
 
 
-async def process_webhook_async(provider: str, event_data: Dict):
-    await event_handler.handle_webhook_event(event_data, provider)
+WEBHOOK_QUEUE_SIZE = 10_000
+WEBHOOK_WORKERS = 32
+WEBHOOK_DRAIN_TIMEOUT = 10
+
+
+async def webhook_worker(queue: asyncio.Queue):
+    while True:
+        provider, event_data = await queue.get()
+        try:
+            await event_handler.handle_webhook_event(event_data, provider)
+        finally:
+            queue.task_done()
+
+
+@app.on_event("startup")
+async def startup():
+    http_client.open_client()
+
+    app.state.queue = asyncio.Queue(maxsize=WEBHOOK_QUEUE_SIZE)
+    app.state.workers = [
+        asyncio.create_task(webhook_worker(app.state.queue))
+        for _ in range(WEBHOOK_WORKERS)
+    ]
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    queue = getattr(app.state, 'queue', None)
+    workers = getattr(app.state, 'workers', [])
+
+    if queue is not None:
+        try:
+            await asyncio.wait_for(queue.join(), timeout=WEBHOOK_DRAIN_TIMEOUT)
+        except asyncio.TimeoutError:
+            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            print(f"[{timestamp}] Shutdown: dropped {queue.qsize()} queued webhook event(s) "
+                  f"after {WEBHOOK_DRAIN_TIMEOUT}s")
+
+    for worker in workers:
+        worker.cancel()
+    await asyncio.gather(*workers, return_exceptions=True)
+
+    await http_client.close_client()
+
+
+def enqueue_webhook(request: Request, provider: str, event_data: Dict):
+    queue = getattr(request.app.state, 'queue', None)
+    if queue is None:
+        raise HTTPException(status_code=503, detail="Webhook queue is not running")
+
+    try:
+        queue.put_nowait((provider, event_data))
+    except asyncio.QueueFull:
+        raise HTTPException(status_code=503, detail="Webhook queue is full")
 
 
 @app.get("/")
@@ -78,10 +146,7 @@ async def root():
 
 
 @app.post("/webhook/incident-io")
-async def receive_incident_io_webhook(
-    request: Request,
-    background_tasks: BackgroundTasks
-):
+async def receive_incident_io_webhook(request: Request):
     payload = await request.body()
 
     webhook_id = request.headers.get("webhook-id")
@@ -89,11 +154,11 @@ async def receive_incident_io_webhook(
     webhook_signature = request.headers.get("webhook-signature")
 
     try:
-        event_data = await request.json()
-    except Exception as e:
+        event_data = orjson.loads(payload)
+    except orjson.JSONDecodeError as e:
         raise HTTPException(status_code=400, detail=f"Invalid JSON: {e}")
 
-    background_tasks.add_task(process_webhook_async, "incident.io", event_data)
+    enqueue_webhook(request, "incident.io", event_data)
 
     return JSONResponse(
         status_code=200,
@@ -102,20 +167,16 @@ async def receive_incident_io_webhook(
 
 
 @app.post("/webhook/generic/{provider_name}")
-async def receive_generic_webhook(
-    provider_name: str,
-    request: Request,
-    background_tasks: BackgroundTasks
-):
+async def receive_generic_webhook(provider_name: str, request: Request):
     payload = await request.body()
     x_signature = request.headers.get("X-Signature") or request.headers.get("X-Hub-Signature-256")
 
     try:
-        event_data = await request.json()
-    except Exception as e:
+        event_data = orjson.loads(payload)
+    except orjson.JSONDecodeError as e:
         raise HTTPException(status_code=400, detail=f"Invalid JSON: {e}")
 
-    background_tasks.add_task(process_webhook_async, provider_name, event_data)
+    enqueue_webhook(request, provider_name, event_data)
 
     return JSONResponse(
         status_code=200,
@@ -134,8 +195,11 @@ async def health_check():
 
 @app.get("/stats")
 async def stats():
+    queue = getattr(app.state, 'queue', None)
     return {
         "seen_incidents_count": len(event_handler.seen_incidents),
+        "seen_incidents_capacity": event_handler.max_seen_incidents,
+        "webhook_queue_depth": queue.qsize() if queue is not None else None,
         "timestamp": datetime.utcnow().isoformat()
     }
 